@@ -115,6 +115,21 @@ if PLATFORM == "Linux":
     except Exception:
         pass
 
+# Scale factor from int16 PCM samples to float32 in [-1, 1)
+_INT16_SCALE = np.float32(1.0 / 32768.0)
+
+def _peak_below(audio_i16, threshold):
+    """Return True if no int16 sample reaches +/-threshold.
+    
+    Scans in blocks and stops at the first loud one, so speech is usually
+    accepted after the first half second instead of a full pass over the clip.
+    """
+    for start in range(0, len(audio_i16), 8192):
+        block = audio_i16[start:start + 8192]
+        if block.max() >= threshold or block.min() <= -threshold:
+            return False
+    return True
+
 class CommandHandler:
     """Handle voice commands with security restrictions."""
     
@@ -287,6 +302,9 @@ class SecureSpeechKeyboard:
         logger.info(f"Model loaded in {load_time:.2f} seconds")
         
         self.language = language
+        self.temperature = self.config['whisper']['temperature']
+        self.no_speech_threshold = self.config['whisper']['no_speech_threshold']
+        self.logprob_threshold = self.config['whisper']['logprob_threshold']
         
         # Command handler
         self.command_handler = CommandHandler(enabled=enable_commands)
@@ -331,13 +349,20 @@ class SecureSpeechKeyboard:
         self.pre_buffer_size = self.config['speech_detection']['pre_buffer_chunks']
         self.pre_buffer = deque(maxlen=self.pre_buffer_size)
         
+        # Reusable byte buffer the speech chunks are copied into (5 s to start,
+        # grown for longer utterances)
+        self._utt_buf = bytearray(self.RATE * 2 * 5)
+        
         # Energy-based filtering
         self.energy_threshold = 0.01
+        self.energy_multiplier = self.config['speech_detection']['energy_threshold_multiplier']
         self.calibrating = True
-        self.noise_levels = deque(maxlen=50)
+        # Running sum/count of calibration noise levels; the mean is all we need
+        self._noise_sum = 0.0
+        self._noise_n = 0
         
         # Load filtering settings
-        self.false_positives = set(self.config['filtering']['false_positives'])
+        self.false_positives = frozenset(fp.strip().lower() for fp in self.config['filtering']['false_positives'])
         self.min_text_length = self.config['filtering']['min_text_length']
         
         # Duplicate detection
@@ -452,7 +477,7 @@ class SecureSpeechKeyboard:
     
     def calculate_energy(self, audio_chunk):
         """Calculate the energy level of an audio chunk."""
-        audio_np = np.frombuffer(audio_chunk, dtype=np.int16).astype(np.float32) / 32768.0
+        audio_np = np.multiply(np.frombuffer(audio_chunk, dtype=np.int16), _INT16_SCALE, dtype=np.float32)
         return np.sqrt(np.mean(audio_np ** 2))
     
     def is_speech(self, audio_chunk):
@@ -463,12 +488,12 @@ class SecureSpeechKeyboard:
             
             # During calibration, collect noise levels
             if self.calibrating:
-                self.noise_levels.append(energy)
+                self._noise_sum += energy
+                self._noise_n += 1
                 return False
             
             # Check if energy is above threshold (with some margin above noise floor)
-            energy_multiplier = self.config['speech_detection']['energy_threshold_multiplier']
-            if energy < self.energy_threshold * energy_multiplier:
+            if energy < self.energy_threshold * self.energy_multiplier:
                 return False
             
             # Then check with VAD
@@ -497,12 +522,14 @@ class SecureSpeechKeyboard:
                 # Calibration phase
                 if self.calibrating:
                     calibration_chunks += 1
-                    self.calculate_energy(audio_chunk)  # Collect noise samples
+                    # Collect noise samples
+                    self._noise_sum += self.calculate_energy(audio_chunk)
+                    self._noise_n += 1
                     
                     if calibration_chunks >= calibration_chunks_needed:
-                        if self.noise_levels:
+                        if self._noise_n:
                             # Set energy threshold based on noise floor
-                            noise_floor = np.mean(list(self.noise_levels))
+                            noise_floor = self._noise_sum / self._noise_n
                             noise_multiplier = self.config['speech_detection']['noise_floor_multiplier']
                             self.energy_threshold = max(0.01, noise_floor * noise_multiplier)
                             print(f"Calibration complete. Noise floor: {noise_floor:.4f}")
@@ -519,12 +546,12 @@ class SecureSpeechKeyboard:
                         print("\r[Listening...]", end='', flush=True)
                         logger.info("Speech detected, starting capture")
                         is_speaking = True
-                        # Add pre-buffer to speech frames to capture the beginning
-                        speech_frames.extend(list(self.pre_buffer))
+                        # Start from the pre-buffer to capture the beginning;
+                        # it already ends with the current chunk
+                        speech_frames = list(self.pre_buffer)
                         # Clear the pre-buffer
                         self.pre_buffer.clear()
-                    
-                    if is_speaking:
+                    elif is_speaking:
                         speech_frames.append(audio_chunk)
                     silence_count = 0
                 else:
@@ -533,8 +560,9 @@ class SecureSpeechKeyboard:
                         speech_frames.append(audio_chunk)
                         
                         if silence_count >= self.silence_threshold:
-                            # Only process if we had enough speech chunks
-                            if len(speech_frames) >= self.min_speech_chunks:
+                            # Only process if we had enough voiced chunks; speech_frames
+                            # also holds the pre-buffer and trailing silence
+                            if speech_count >= self.min_speech_chunks:
                                 print(" [Processing...]", end='', flush=True)
                                 logger.info(f"Speech ended, processing {len(speech_frames)} frames")
                                 self.recognize_and_type(speech_frames)
@@ -562,23 +590,39 @@ class SecureSpeechKeyboard:
         try:
             start_time = time.time()
             
-            audio_data = b''.join(audio_frames)
-            audio_np = np.frombuffer(audio_data, dtype=np.int16).astype(np.float32) / 32768.0
+            # Copy the chunks into the reusable buffer instead of joining into new bytes
+            n = sum(map(len, audio_frames))
+            if n > len(self._utt_buf):
+                self._utt_buf = bytearray(n)
+            utt_buf = self._utt_buf
+            offset = 0
+            for frame in audio_frames:
+                utt_buf[offset:offset + len(frame)] = frame
+                offset += len(frame)
+            audio_i16 = np.frombuffer(utt_buf, dtype=np.int16, count=n // 2)
             
-            # Additional check: ensure audio has sufficient energy
-            if np.max(np.abs(audio_np)) < 0.01:
+            # Additional check: ensure audio has sufficient energy (peak of 0.01
+            # full scale), before paying for the float conversion or Whisper
+            if _peak_below(audio_i16, 328):
                 print("\r[Audio too quiet]", end='', flush=True)
                 return
             
+            audio_np = np.multiply(audio_i16, _INT16_SCALE, dtype=np.float32)
+            
             logger.debug(f"Processing {len(audio_np)/self.RATE:.2f} seconds of audio")
             
             result = self.model.transcribe(
                 audio_np,
                 language=self.language,
                 fp16=False,
-                temperature=self.config['whisper']['temperature'],
-                no_speech_threshold=self.config['whisper']['no_speech_threshold'],
-                logprob_threshold=self.config['whisper']['logprob_threshold']
+                temperature=self.temperature,
+                no_speech_threshold=self.no_speech_threshold,
+                logprob_threshold=self.logprob_threshold,
+                # One utterance per call: no prompt carry-over. Timestamp tokens are
+                # only skipped when the clip fits one 30 s window; longer clips need
+                # them so whisper seeks to segment ends instead of cutting words
+                condition_on_previous_text=False,
+                without_timestamps=len(audio_np) <= 30 * self.RATE
             )
             
             recognition_time = time.time() - start_time
@@ -588,7 +632,7 @@ class SecureSpeechKeyboard:
             text = result['text'].strip()
             
             # Filter out false positives using configuration
-            if text and text not in self.false_positives and len(text) > self.min_text_length:
+            if text and text.lower() not in self.false_positives and len(text) > self.min_text_length:
                 # Check for duplicates
                 current_time = time.time()
                 if text == self.last_text and (current_time - self.last_text_time) < self.duplicate_threshold:
@@ -707,30 +751,43 @@ def kill_existing_instances():
     
     try:
         # Find all python processes running speech_to_keyboard
-        result = subprocess.run(
-            ["pgrep", "-f", "python.*speech_to_keyboard"],
-            capture_output=True,
-            text=True
-        )
+        if os.path.isdir('/proc'):
+            # Read /proc directly rather than forking pgrep
+            pids = []
+            for pid_dir in os.listdir('/proc'):
+                if not pid_dir.isdigit():
+                    continue
+                try:
+                    with open(f'/proc/{pid_dir}/cmdline', 'rb') as f:
+                        cmd = f.read().replace(b'\0', b' ').decode(errors='ignore')
+                except OSError:
+                    # Process exited while scanning
+                    continue
+                if 'python' in cmd and 'speech_to_keyboard' in cmd:
+                    pids.append(int(pid_dir))
+        else:
+            # No /proc (macOS); pgrep raises FileNotFoundError on Windows
+            result = subprocess.run(
+                ["pgrep", "-f", "python.*speech_to_keyboard"],
+                capture_output=True,
+                text=True
+            )
+            pids = [int(pid_str) for pid_str in result.stdout.split()] if result.returncode == 0 else []
         
-        if result.returncode == 0:
-            pids = result.stdout.strip().split('\n')
-            for pid_str in pids:
-                if pid_str:
-                    pid = int(pid_str)
-                    # Don't kill ourselves
-                    if pid != current_pid:
-                        try:
-                            os.kill(pid, signal.SIGTERM)
-                            logger.info(f"Killed existing instance with PID {pid}")
-                            print(f"Killed existing instance (PID: {pid})")
-                            # Give it a moment to clean up
-                            time.sleep(0.5)
-                        except ProcessLookupError:
-                            # Process already gone
-                            pass
-                        except Exception as e:
-                            logger.warning(f"Failed to kill PID {pid}: {e}")
+        for pid in pids:
+            # Don't kill ourselves
+            if pid != current_pid:
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                    logger.info(f"Killed existing instance with PID {pid}")
+                    print(f"Killed existing instance (PID: {pid})")
+                    # Give it a moment to clean up
+                    time.sleep(0.5)
+                except ProcessLookupError:
+                    # Process already gone
+                    pass
+                except Exception as e:
+                    logger.warning(f"Failed to kill PID {pid}: {e}")
     except FileNotFoundError:
         # pgrep not available (Windows), try alternative method
         if PLATFORM == "Windows":
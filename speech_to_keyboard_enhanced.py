@@ -33,15 +33,17 @@ import threading
 import queue
 import json
 import os
+import importlib.util
+import math
+import shutil
+import sqlite3
 import numpy as np
-import pyaudio
-import whisper
 from pynput import keyboard
 from pynput.keyboard import Controller, Key
-import webrtcvad
 from collections import deque
 import argparse
 import logging
+import logging.handlers
 from datetime import datetime
 import platform
 import subprocess
@@ -50,18 +52,33 @@ import signal
 # Detect platform
 PLATFORM = platform.system()
 
-# Configure logging
+# Configure logging. File writes go through a MemoryHandler and are flushed
+# in batches of 32 records (or at once on a warning), so debug output from
+# the audio thread never waits on disk I/O.
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+_file_handler = logging.FileHandler('logs/enhanced_runtime.log')
+_file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    format=LOG_FORMAT,
     handlers=[
-        logging.FileHandler('logs/enhanced_runtime.log'),
+        logging.handlers.MemoryHandler(32, flushLevel=logging.WARNING, target=_file_handler),
         logging.StreamHandler()
     ]
 )
 logger = logging.getLogger(__name__)
 logger.info(f"Running on {PLATFORM}")
 
+def _exit_on_sigterm(signum, frame):
+    """Exit normally on SIGTERM (how a newer instance stops this one).
+    
+    The default action kills the process outright, losing the records still
+    held by the MemoryHandler; a normal exit runs the cleanup in run() and
+    logging's shutdown hook, which flushes them to the log file.
+    """
+    logger.info("Received SIGTERM, shutting down")
+    sys.exit(0)
+
 # Suppress ALSA warnings on Linux
 if PLATFORM == "Linux":
     try:
@@ -78,6 +95,74 @@ if PLATFORM == "Linux":
     except Exception:
         pass
 
+# Scale factor from int16 PCM samples to float32 in [-1, 1)
+_INT16_SCALE = np.float32(1.0 / 32768.0)
+
+def _peak_below(audio_i16, threshold):
+    """Return True if no int16 sample reaches +/-threshold.
+    
+    Scans in blocks and stops at the first loud one, so speech is usually
+    accepted after the first half second instead of a full pass over the clip.
+    """
+    for start in range(0, len(audio_i16), 8192):
+        block = audio_i16[start:start + 8192]
+        if block.max() >= threshold or block.min() <= -threshold:
+            return False
+    return True
+
+# Native text injection. pynput sends every character as its own OS event;
+# these paths hand the whole string to the OS in one call instead.
+_XDOTOOL = shutil.which("xdotool") if PLATFORM == "Linux" and os.environ.get("DISPLAY") else None
+
+if PLATFORM == "Windows":
+    import ctypes
+    from ctypes import wintypes
+    
+    INPUT_KEYBOARD = 1
+    KEYEVENTF_KEYUP = 0x0002
+    KEYEVENTF_UNICODE = 0x0004
+    
+    class _KEYBDINPUT(ctypes.Structure):
+        _fields_ = [("wVk", wintypes.WORD), ("wScan", wintypes.WORD), ("dwFlags", wintypes.DWORD),
+                    ("time", wintypes.DWORD), ("dwExtraInfo", ctypes.c_size_t)]
+    
+    class _MOUSEINPUT(ctypes.Structure):
+        # Only here so the union, and therefore INPUT, has the size SendInput expects
+        _fields_ = [("dx", wintypes.LONG), ("dy", wintypes.LONG), ("mouseData", wintypes.DWORD),
+                    ("dwFlags", wintypes.DWORD), ("time", wintypes.DWORD), ("dwExtraInfo", ctypes.c_size_t)]
+    
+    class _INPUTUNION(ctypes.Union):
+        _fields_ = [("ki", _KEYBDINPUT), ("mi", _MOUSEINPUT)]
+    
+    class _INPUT(ctypes.Structure):
+        _fields_ = [("type", wintypes.DWORD), ("u", _INPUTUNION)]
+
+def inject_text(text):
+    """Type text through the platform input API in one call.
+    
+    Returns False when no native path is available so the caller can fall
+    back to pynput.
+    """
+    if PLATFORM == "Windows":
+        # One key-down/key-up pair per UTF-16 code unit, all in a single SendInput
+        units = text.encode('utf-16-le')
+        codes = [int.from_bytes(units[i:i + 2], 'little') for i in range(0, len(units), 2)]
+        inputs = (_INPUT * (2 * len(codes)))()
+        for i, code in enumerate(codes):
+            for j, flags in enumerate((KEYEVENTF_UNICODE, KEYEVENTF_UNICODE | KEYEVENTF_KEYUP)):
+                event = inputs[2 * i + j]
+                event.type = INPUT_KEYBOARD
+                event.u.ki.wScan = code
+                event.u.ki.dwFlags = flags
+        sent = ctypes.windll.user32.SendInput(len(inputs), inputs, ctypes.sizeof(_INPUT))
+        return sent == len(inputs)
+    
+    if _XDOTOOL:
+        subprocess.run([_XDOTOOL, "type", "--delay", "0", "--", text], check=True)
+        return True
+    
+    return False
+
 class SpeechToKeyboard:
     def __init__(self, config_file="speech_config.json"):
         """
@@ -87,10 +172,15 @@ class SpeechToKeyboard:
             config_file: Path to JSON configuration file
         """
         # Load configuration
+        self.config_file = config_file
         self.load_config(config_file)
+        self._build_filters()
+        
+        self._load_model()
         
-        print(f"Loading Whisper {self.config['whisper']['model_size']} model... This may take a moment on first run.")
-        self.model = whisper.load_model(self.config['whisper']['model_size'])
+        # Imported here rather than at module level so --help stays instant
+        import pyaudio
+        import webrtcvad
         
         # Audio settings from config
         self.RATE = self.config['audio']['rate']
@@ -98,12 +188,19 @@ class SpeechToKeyboard:
         self.FORMAT = pyaudio.paInt16
         self.CHANNELS = self.config['audio']['channels']
         
+        # Reusable float32 buffer covering Whisper's 30 s window
+        self._scratch_f32 = np.empty(self.RATE * 30, dtype=np.float32)
+        
+        # Optional cache of transcriptions for short, repeated utterances
+        self._cache_db = self._open_cache()
+        
         # Voice activity detection
         self.vad = webrtcvad.Vad(self.config['detection']['vad_aggressiveness'])
         
         # Audio stream
         self.audio = pyaudio.PyAudio()
         self.stream = None
+        self._pa_continue = pyaudio.paContinue
         
         # Keyboard controller
         self.keyboard_controller = Controller()
@@ -111,7 +208,11 @@ class SpeechToKeyboard:
         # State
         self.listening = False
         self.running = True
-        self.audio_queue = queue.Queue()
+        self._shutdown = threading.Event()
+        
+        # Completed utterances waiting for Whisper (bounded so a slow model
+        # applies backpressure instead of growing without limit)
+        self._transcribe_q = queue.Queue(maxsize=4)
         
         # Detection parameters from config
         self.silence_threshold = self.config['detection']['silence_threshold_chunks']
@@ -119,23 +220,455 @@ class SpeechToKeyboard:
         self.energy_multiplier = self.config['detection']['energy_threshold_multiplier']
         self.consecutive_speech = self.config['detection']['consecutive_speech_chunks']
         self.calibration_seconds = self.config['detection']['calibration_duration_seconds']
+        self.vad_bypass_multiplier = self.config['detection']['vad_bypass_multiplier']
         
-        # Audio buffer settings from config
-        self.speech_buffer = deque(maxlen=150)
+        # Decoding options, read once instead of indexing the config per utterance
+        whisper_config = self.config['whisper']
+        self._language = whisper_config['language']
+        self._temperature = whisper_config['temperature']
+        self._no_speech_threshold = whisper_config['no_speech_threshold']
+        self._logprob_threshold = whisper_config['logprob_threshold']
+        cache_config = self.config['cache']
+        self._cache_max_samples = int(self.RATE * cache_config['max_seconds'])
+        self._cache_min_similarity = cache_config['min_similarity']
+        self._cache_max_entries = cache_config['max_entries']
+        
+        # Speech samples for the current utterance, sized for Whisper's 30 s window
+        self._frame_buf = np.empty(self.RATE * 30, dtype=np.int16)
         
         # Pre-buffer to capture audio before speech detection
         self.pre_buffer_size = self.config['detection'].get('pre_buffer_chunks', 15)
         self.pre_buffer = deque(maxlen=self.pre_buffer_size)
         
+        # Single-producer/single-consumer ring of ~10 s of audio chunks. The
+        # audio callback only writes and advances _ring_w, process_audio only
+        # reads and advances _ring_r; the GIL keeps the index updates atomic,
+        # so no per-chunk lock or allocation is needed.
+        self._ring_slots = max(self.RATE * 10 // self.CHUNK, self.pre_buffer_size + 2)
+        self._ring = np.empty((self._ring_slots, self.CHUNK), dtype=np.int16)
+        self._ring_w = 0
+        self._ring_r = 0
+        self._ring_ready = threading.Event()
+        
         # Energy-based filtering
-        self.noise_levels = deque(maxlen=50)
+        self._noise_sum = 0.0
+        self._noise_n = 0
         self.energy_threshold = 0.01
         self.calibrating = True
+        self._speech_gate = self._build_speech_gate()
         
         print(f"Model loaded successfully!")
         print(f"Pre-buffer: {self.pre_buffer_size} chunks (~{self.pre_buffer_size * 30}ms)")
         print(f"Calibrating noise level... Please remain quiet for {self.calibration_seconds} seconds.")
         
+    def _load_model(self):
+        """Load the Whisper model for the configured backend."""
+        whisper_config = self.config['whisper']
+        model_size = whisper_config['model_size']
+        self.backend = whisper_config.get('backend', 'auto')
+        self.device = "cpu"
+        self.compute_type = "native"
+        self.fp16 = False
+        self._decode_opts = None
+        
+        if self.backend in ("auto", "faster-whisper"):
+            try:
+                import ctranslate2
+                from faster_whisper import WhisperModel
+            except ImportError:
+                if self.backend == "faster-whisper":
+                    print("faster-whisper not installed, falling back to openai-whisper. Install with: pip install faster-whisper")
+                self.backend = "openai"
+            else:
+                self.backend = "faster-whisper"
+                # CTranslate2 runs int8 GEMMs on CPU and int8 weights with FP16 activations on GPU
+                self.device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+                self.compute_type = "int8_float16" if self.device == "cuda" else "int8"
+                model_path = self._converted_model_dir(model_size, self.compute_type)
+                print(f"Loading faster-whisper {model_size} model on {self.device}... This may take a moment on first run.")
+                self.model = WhisperModel(
+                    model_path,
+                    device=self.device,
+                    compute_type=self.compute_type,
+                    cpu_threads=os.cpu_count()
+                )
+                return
+        
+        if self.backend == "transformers":
+            try:
+                import torch
+                from transformers import WhisperForConditionalGeneration, WhisperProcessor
+            except ImportError:
+                print("transformers not installed, falling back to openai-whisper. Install with: pip install transformers")
+                self.backend = "openai"
+            else:
+                self.device = "cuda" if torch.cuda.is_available() else "cpu"
+                self.fp16 = self.device == "cuda"
+                self.compute_type = "fp16" if self.fp16 else "fp32"
+                model_id = f"openai/whisper-{model_size}"
+                print(f"Loading {model_id} with transformers on {self.device}... This may take a moment on first run.")
+                self.processor = WhisperProcessor.from_pretrained(model_id)
+                self.model = WhisperForConditionalGeneration.from_pretrained(
+                    model_id,
+                    torch_dtype=torch.float16 if self.fp16 else torch.float32
+                ).to(self.device)
+                # A static KV cache gives the decoder fixed shapes, so torch.compile
+                # can capture it once instead of re-tracing as the cache grows
+                self.model.generation_config.cache_implementation = "static"
+                self.model.forward = torch.compile(self.model.forward, mode="reduce-overhead", fullgraph=False)
+                return
+        
+        if self.backend == "onnx":
+            try:
+                from optimum.onnxruntime import ORTModelForSpeechSeq2Seq
+                from transformers import WhisperProcessor
+            except ImportError:
+                print("optimum/onnxruntime not installed, falling back to openai-whisper. Install with: pip install optimum[onnxruntime]")
+                self.backend = "openai"
+            else:
+                model_id = f"openai/whisper-{model_size}"
+                model_dir = self._onnx_model_dir(model_id, model_size)
+                if model_dir is None:
+                    self.backend = "openai"
+                else:
+                    self.compute_type = "int8"
+                    print(f"Loading {model_id} with ONNX Runtime... This may take a moment on first run.")
+                    self.processor = WhisperProcessor.from_pretrained(model_id)
+                    self.model = ORTModelForSpeechSeq2Seq.from_pretrained(
+                        model_dir,
+                        provider="CPUExecutionProvider"
+                    )
+                    return
+        
+        if self.backend == "whispercpp":
+            try:
+                from pywhispercpp.model import Model
+            except ImportError:
+                print("pywhispercpp not installed, falling back to openai-whisper. Install with: pip install pywhispercpp")
+                self.backend = "openai"
+            else:
+                print(f"Loading whisper.cpp {model_size} model... This may take a moment on first run.")
+                self.model = Model(
+                    model_size,
+                    n_threads=os.cpu_count(),
+                    print_progress=False,
+                    print_realtime=False
+                )
+                return
+        
+        # whisper pulls in torch, which takes a second or two to import
+        import torch
+        import whisper
+        
+        # Run on the GPU when one is available; FP16 is only worthwhile there
+        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        self.fp16 = self.device == "cuda"
+        self.compute_type = "fp16" if self.fp16 else "fp32"
+        
+        print(f"Loading Whisper {model_size} model on {self.device}... This may take a moment on first run.")
+        self.model = whisper.load_model(model_size, device=self.device)
+        
+        # transcribe() rebuilds its decoding options and runs a seek loop on every
+        # call; clips that fit in one 30 s window are decoded directly with options
+        # built once here. Temperature fallback needs transcribe(), so this only
+        # applies to a single temperature.
+        self._whisper = whisper
+        if isinstance(whisper_config['temperature'], (int, float)):
+            self._decode_opts = whisper.DecodingOptions(
+                task="transcribe",
+                language=whisper_config['language'],
+                temperature=whisper_config['temperature'],
+                without_timestamps=True,
+                fp16=self.fp16
+            )
+    
+    def _converted_model_dir(self, model_size, quantization):
+        """Return a pre-quantized CTranslate2 model directory, converting it on first use.
+        
+        Loading weights that are already quantized on disk skips the conversion
+        faster-whisper otherwise does on every start. Falls back to the stock
+        model name when the converter or its dependencies are missing, or when
+        a previous conversion failed (delete the .failed marker to retry).
+        """
+        cache_dir = os.path.expanduser(f"~/.cache/vibe-ai-keyboard/whisper-{model_size}-{quantization}")
+        if os.path.isfile(os.path.join(cache_dir, "model.bin")):
+            logger.info(f"Model cache hit: {cache_dir}")
+            return cache_dir
+        logger.info(f"Model cache miss: {cache_dir}")
+        
+        failed_marker = cache_dir + ".failed"
+        if os.path.exists(failed_marker):
+            logger.info(f"Model conversion failed before, using the stock model (delete {failed_marker} to retry)")
+            return model_size
+        
+        converter = shutil.which("ct2-transformers-converter")
+        if (converter is None or importlib.util.find_spec("transformers") is None
+                or importlib.util.find_spec("torch") is None):
+            logger.info("ct2-transformers-converter, transformers or torch not available, using the stock model")
+            return model_size
+        
+        print(f"Converting whisper-{model_size} to a {quantization} model (first run only)...")
+        result = subprocess.run(
+            [
+                converter,
+                "--model", f"openai/whisper-{model_size}",
+                "--output_dir", cache_dir,
+                "--quantization", quantization,
+                "--copy_files", "tokenizer.json", "preprocessor_config.json"
+            ],
+            capture_output=True,
+            text=True
+        )
+        if result.returncode != 0:
+            logger.warning(f"Model conversion failed, using the stock model: {result.stderr.strip()}")
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            # Remember the failure so later starts don't rerun the converter
+            try:
+                with open(failed_marker, 'w') as f:
+                    f.write(result.stderr)
+            except OSError:
+                pass
+            return model_size
+        
+        return cache_dir
+    
+    def _decode_batch(self, clips):
+        """Decode float32 clips of up to 30 s each with the prebuilt options (openai backend).
+        
+        All clips go through the encoder as one batch; each gets its own text.
+        """
+        import torch
+        
+        mel = torch.stack([self._log_mel(audio_np) for audio_np in clips])
+        texts = []
+        no_speech_threshold = self._no_speech_threshold
+        logprob_threshold = self._logprob_threshold
+        for result in self.model.decode(mel, self._decode_opts):
+            # Same no-speech rule transcribe() applies to each segment; either
+            # threshold may be None, which transcribe() treats as "don't check"
+            should_skip = (no_speech_threshold is not None and
+                           result.no_speech_prob > no_speech_threshold)
+            if logprob_threshold is not None and result.avg_logprob > logprob_threshold:
+                should_skip = False
+            if should_skip:
+                texts.append("")
+            else:
+                texts.append(result.text.strip())
+        return texts
+    
+    def _log_mel(self, audio_np):
+        """Log-mel features of one clip padded to the 30 s window (openai backend).
+        
+        Padding frames only ever see zeros, and log_mel_spectrogram clamps those
+        to max - 2 (or -1.5), so the STFT runs over the clip alone and the rest
+        of the window is filled with that value instead of being recomputed.
+        """
+        whisper = self._whisper
+        audio = whisper.audio
+        n_mels = self.model.dims.n_mels
+        if len(audio_np) >= audio.N_SAMPLES:
+            return whisper.log_mel_spectrogram(
+                whisper.pad_or_trim(audio_np), n_mels=n_mels, device=self.model.device
+            )
+        
+        mel = whisper.log_mel_spectrogram(
+            audio_np, n_mels=n_mels, padding=audio.N_FFT, device=self.model.device
+        )
+        # Frames whose STFT window still overlaps the clip
+        valid = min((len(audio_np) + audio.N_FFT // 2) // audio.HOP_LENGTH + 1, audio.N_FRAMES)
+        floor = max(mel.max().item() - 2.0, -1.5)
+        out = mel.new_full((n_mels, audio.N_FRAMES), floor)
+        out[:, :valid] = mel[:, :valid]
+        return out
+    
+    def _onnx_model_dir(self, model_id, model_size):
+        """Return an int8 ONNX export of the model, exporting it on first use.
+        
+        Returns None when the export or quantization fails.
+        """
+        cache_dir = os.path.expanduser(f"~/.cache/vibe-ai-keyboard/whisper-{model_size}-onnx-int8")
+        if os.path.isfile(os.path.join(cache_dir, "encoder_model.onnx")):
+            logger.info(f"Model cache hit: {cache_dir}")
+            return cache_dir
+        logger.info(f"Model cache miss: {cache_dir}")
+        
+        import tempfile
+        from optimum.onnxruntime import ORTModelForSpeechSeq2Seq
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        
+        print(f"Exporting {model_id} to ONNX and quantizing to int8 (first run only)...")
+        # Build in a scratch directory and move it into place at the end, so an
+        # interrupted export never looks like a cache hit
+        partial_dir = cache_dir + ".partial"
+        shutil.rmtree(partial_dir, ignore_errors=True)
+        try:
+            with tempfile.TemporaryDirectory() as export_dir:
+                ORTModelForSpeechSeq2Seq.from_pretrained(model_id, export=True).save_pretrained(export_dir)
+                os.makedirs(partial_dir)
+                for name in os.listdir(export_dir):
+                    src = os.path.join(export_dir, name)
+                    if name.endswith(".onnx"):
+                        quantize_dynamic(src, os.path.join(partial_dir, name), weight_type=QuantType.QInt8)
+                    else:
+                        shutil.copy(src, partial_dir)
+            os.rename(partial_dir, cache_dir)
+        except Exception as e:
+            logger.warning(f"ONNX export failed, falling back to openai-whisper: {e}")
+            shutil.rmtree(partial_dir, ignore_errors=True)
+            return None
+        
+        return cache_dir
+    
+    def _transcribe(self, audio_np):
+        """Run the loaded model on float32 audio and return the recognized text."""
+        if self.backend == "faster-whisper":
+            segments, _ = self.model.transcribe(
+                audio_np,
+                language=self._language,
+                beam_size=1,
+                vad_filter=False,
+                condition_on_previous_text=False,
+                # Long dictations need timestamp tokens to seek to segment ends
+                # instead of cutting words at fixed 30 s windows
+                without_timestamps=len(audio_np) <= 30 * self.RATE,
+                temperature=self._temperature,
+                no_speech_threshold=self._no_speech_threshold,
+                log_prob_threshold=self._logprob_threshold
+            )
+            # Segments are produced lazily; joining them runs the decoder
+            return "".join(segment.text for segment in segments).strip()
+        
+        if self.backend == "transformers":
+            features = self.processor(
+                audio_np,
+                sampling_rate=16000,
+                return_tensors="pt"
+            ).input_features.to(self.device, dtype=self.model.dtype)
+            token_ids = self.model.generate(
+                features,
+                language=self._language,
+                task="transcribe"
+            )
+            return self.processor.batch_decode(token_ids, skip_special_tokens=True)[0].strip()
+        
+        if self.backend == "onnx":
+            features = self.processor(
+                audio_np,
+                sampling_rate=16000,
+                return_tensors="pt"
+            ).input_features
+            token_ids = self.model.generate(
+                features,
+                language=self._language,
+                task="transcribe"
+            )
+            return self.processor.batch_decode(token_ids, skip_special_tokens=True)[0].strip()
+        
+        if self.backend == "whispercpp":
+            segments = self.model.transcribe(
+                audio_np,
+                language=self._language or "auto",
+                temperature=self._temperature
+            )
+            return " ".join(segment.text for segment in segments).strip()
+        
+        if self._decode_opts is not None and len(audio_np) <= self._whisper.audio.N_SAMPLES:
+            return self._decode_batch([audio_np])[0]
+        
+        result = self.model.transcribe(
+            audio_np,
+            language=self._language,
+            fp16=self.fp16,
+            temperature=self._temperature,
+            no_speech_threshold=self._no_speech_threshold,
+            logprob_threshold=self._logprob_threshold
+        )
+        return result['text'].strip()
+    
+    def _open_cache(self):
+        """Open the transcription cache database, or return None if it is disabled."""
+        cache_config = self.config['cache']
+        if not cache_config['enabled']:
+            return None
+        
+        path = os.path.expanduser(cache_config['path'])
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Only the transcription thread queries the connection after startup
+            db = sqlite3.connect(path, check_same_thread=False)
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS clips ("
+                "id INTEGER PRIMARY KEY, duration INTEGER, features BLOB, text TEXT, ts REAL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS clips_duration ON clips (duration)")
+            # Forget clips that have not been used recently
+            max_age = cache_config['max_age_days'] * 86400
+            db.execute("DELETE FROM clips WHERE ts < ?", (time.time() - max_age,))
+            db.commit()
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Transcription cache disabled: {e}")
+            return None
+        
+        logger.info(f"Transcription cache: {path}")
+        return db
+    
+    def _audio_features(self, audio_np):
+        """Coarse spectral shape of a clip for cache lookups, or None if it is too short.
+        
+        Log energies in 8 bands (100 Hz - 4 kHz) over 8 equal time slices,
+        standardized to zero mean and unit variance. Two takes of the same
+        phrase never match sample for sample, so lookups compare these
+        vectors by correlation instead of by exact key.
+        """
+        seg_len = len(audio_np) // 8
+        if seg_len < self.RATE // 32:
+            return None
+        
+        slices = audio_np[:seg_len * 8].reshape(8, seg_len)
+        power = np.abs(np.fft.rfft(slices, axis=1)) ** 2
+        edges = np.round(np.geomspace(100, 4000, 9) * seg_len / self.RATE).astype(np.intp)
+        bands = np.add.reduceat(power, edges, axis=1)[:, :-1]
+        features = np.log10(bands + 1e-10).ravel()
+        
+        std = features.std()
+        if std == 0:
+            return None
+        return ((features - features.mean()) / std).astype(np.float32)
+    
+    def _cache_lookup(self, features, duration):
+        """Return the text of the most similar cached clip of about the same length, or None."""
+        rows = self._cache_db.execute(
+            "SELECT id, features, text FROM clips WHERE duration BETWEEN ? AND ?",
+            (duration - 1, duration + 1)
+        ).fetchall()
+        
+        best_id = None
+        best_text = None
+        best_similarity = self._cache_min_similarity
+        for row_id, blob, text in rows:
+            # Mean product of standardized vectors is their correlation
+            similarity = float(np.dot(np.frombuffer(blob, dtype=np.float32), features)) / len(features)
+            if similarity >= best_similarity:
+                best_id, best_text, best_similarity = row_id, text, similarity
+        
+        if best_id is not None:
+            # Refresh the timestamp so eviction drops the least recently used clips
+            self._cache_db.execute("UPDATE clips SET ts = ? WHERE id = ?", (time.time(), best_id))
+            self._cache_db.commit()
+        return best_text
+    
+    def _cache_store(self, features, duration, text):
+        """Remember a transcription, evicting the least recently used clips past max_entries."""
+        self._cache_db.execute(
+            "INSERT INTO clips (duration, features, text, ts) VALUES (?, ?, ?, ?)",
+            (duration, features.tobytes(), text, time.time())
+        )
+        self._cache_db.execute(
+            "DELETE FROM clips WHERE id NOT IN (SELECT id FROM clips ORDER BY ts DESC LIMIT ?)",
+            (self._cache_max_entries,)
+        )
+        self._cache_db.commit()
+    
     def load_config(self, config_file):
         """Load configuration from JSON file."""
         default_config = {
@@ -152,9 +685,11 @@ class SpeechToKeyboard:
                 "pre_buffer_chunks": 15,
                 "energy_threshold_multiplier": 1.5,
                 "noise_floor_multiplier": 3,
-                "calibration_duration_seconds": 2
+                "calibration_duration_seconds": 2,
+                "vad_bypass_multiplier": 2.0
             },
             "whisper": {
+                "backend": "auto",
                 "model_size": "base",
                 "language": "en",
                 "temperature": 0.1,
@@ -164,6 +699,19 @@ class SpeechToKeyboard:
             "filtering": {
                 "min_text_length": 3,
                 "false_positives": []
+            },
+            "typing": {
+                "clipboard_paste": False,
+                "paste_min_length": 40,
+                "native_injection": True
+            },
+            "cache": {
+                "enabled": False,
+                "path": "~/.cache/vibe-ai-keyboard/stt_cache.db",
+                "max_seconds": 2.0,
+                "min_similarity": 0.9,
+                "max_entries": 500,
+                "max_age_days": 30
             }
         }
         
@@ -188,6 +736,21 @@ class SpeechToKeyboard:
             except:
                 pass
     
+    def _build_filters(self):
+        """Precompute the text filters checked on every transcription."""
+        filter_config = self.config['filtering']
+        self._false_positives = frozenset(fp.strip().lower() for fp in filter_config['false_positives'])
+        self._min_text_length = filter_config['min_text_length']
+    
+    def reload_config(self):
+        """Re-read the configuration file and rebuild the text filters.
+        
+        Filtering and typing options take effect immediately; audio,
+        detection, model and cache settings still require a restart.
+        """
+        self.load_config(self.config_file)
+        self._build_filters()
+    
     def _merge_configs(self, default, loaded):
         """Recursively merge loaded config with defaults."""
         result = default.copy()
@@ -236,151 +799,359 @@ class SpeechToKeyboard:
     def audio_callback(self, in_data, frame_count, time_info, status):
         """Callback for audio stream."""
         if self.listening or self.calibrating:
-            self.audio_queue.put(in_data)
-        return (in_data, pyaudio.paContinue)
+            w = self._ring_w
+            self._ring[w % self._ring_slots] = np.frombuffer(in_data, dtype=np.int16)
+            self._ring_w = w + 1
+            self._ring_ready.set()
+        return (in_data, self._pa_continue)
     
     def calculate_energy(self, audio_chunk):
-        """Calculate the energy level of an audio chunk."""
-        audio_np = np.frombuffer(audio_chunk, dtype=np.int16).astype(np.float32) / 32768.0
-        return np.sqrt(np.mean(audio_np ** 2))
+        """Calculate the energy level of an int16 audio chunk."""
+        # Sum of squares in int64 avoids the float32 copy and the squared temporary
+        sum_sq = int(np.dot(audio_chunk.astype(np.int64), audio_chunk))
+        return math.sqrt(sum_sq / audio_chunk.size) * (1.0 / 32768.0)
     
     def is_speech(self, audio_chunk):
         """Check if audio chunk contains speech with energy filtering."""
         try:
-            # First check energy level
-            energy = self.calculate_energy(audio_chunk)
-            
             # During calibration, collect noise levels
             if self.calibrating:
-                self.noise_levels.append(energy)
+                self._noise_sum += self.calculate_energy(audio_chunk)
+                self._noise_n += 1
                 return False
             
+            return self._speech_gate(audio_chunk)
+        except:
+            return False
+    
+    def _build_speech_gate(self):
+        """Build the per-chunk speech test with the current thresholds baked in.
+        
+        The thresholds only change when calibration finishes, so they are
+        computed once here instead of on every chunk. They are squared and
+        scaled to int16 units so each chunk is tested on its raw sum of
+        squares, without a square root or float conversion.
+        """
+        speech_gate = self.energy_threshold * self.energy_multiplier
+        speech_sq = (speech_gate * 32768.0) ** 2
+        if self.vad_bypass_multiplier:
+            bypass_sq = (speech_gate * self.vad_bypass_multiplier * 32768.0) ** 2
+        else:
+            bypass_sq = float('inf')
+        dot = np.dot
+        int64 = np.int64
+        vad_is_speech = self.vad.is_speech
+        rate = self.RATE
+        
+        def gate(audio_chunk):
+            sum_sq = int(dot(audio_chunk.astype(int64), audio_chunk))
+            n = audio_chunk.size
+            
             # Check if energy is above threshold
-            if energy < self.energy_threshold * self.energy_multiplier:
+            if sum_sq < speech_sq * n:
                 return False
             
-            # Then check with VAD
-            return self.vad.is_speech(audio_chunk, self.RATE)
-        except:
-            return False
+            # Clearly loud chunks are accepted without running the VAD
+            if sum_sq >= bypass_sq * n:
+                return True
+            
+            # Then check with VAD (webrtcvad measures frame length in bytes)
+            return vad_is_speech(audio_chunk.view(np.uint8), rate)
+        
+        return gate
     
     def process_audio(self):
-        """Process audio from the queue."""
-        speech_frames = []
+        """Process audio chunks from the ring buffer."""
         silence_count = 0
         speech_count = 0
         is_speaking = False
         calibration_chunks = 0
         calibration_total = int(self.calibration_seconds * self.RATE / self.CHUNK)
+        # The noise floor usually settles well before calibration_seconds;
+        # stop as soon as the last 16 levels are stable (spread within 10% of
+        # their mean, since RMS levels are small and an absolute bound isn't)
+        noise_window = deque(maxlen=16)
+        
+        # Bind per-chunk lookups to locals once; only calibrating changes while running
+        ring = self._ring
+        ring_slots = self._ring_slots
+        ring_ready = self._ring_ready
+        # Chunks in the pre-buffer are views into the ring, so never fall
+        # further behind than the ring can hold without overwriting them
+        max_lag = ring_slots - self.pre_buffer_size - 1
+        is_speech = self.is_speech
+        pre_buffer = self.pre_buffer
+        transcribe_put = self._transcribe_q.put
+        silence_threshold = self.silence_threshold
+        chunk_size = self.CHUNK
+        min_speech_samples = self.min_speech_chunks * chunk_size
+        consecutive_speech = self.consecutive_speech
+        calibrating = self.calibrating
+        
+        # Speech is copied straight into one preallocated buffer rather than
+        # collected as a list of chunks and concatenated at the end
+        frame_buf = self._frame_buf
+        frame_len = 0
+        
+        def append(frame):
+            nonlocal frame_buf, frame_len
+            end = frame_len + len(frame)
+            if end > len(frame_buf):
+                # Unusually long utterance: grow the buffer
+                grown = np.empty(max(end, 2 * len(frame_buf)), dtype=np.int16)
+                grown[:frame_len] = frame_buf[:frame_len]
+                frame_buf = self._frame_buf = grown
+            frame_buf[frame_len:end] = frame
+            frame_len = end
         
         while self.running:
-            try:
-                # Get audio chunk from queue
-                audio_chunk = self.audio_queue.get(timeout=0.1)
-                
-                # Calibration phase
-                if self.calibrating:
-                    calibration_chunks += 1
-                    self.calculate_energy(audio_chunk)
+            # Wait for the callback to write, then process everything written so far
+            r = self._ring_r
+            w = self._ring_w
+            if r == w:
+                ring_ready.wait(0.1)
+                ring_ready.clear()
+                continue
+            
+            if w - r > max_lag:
+                logger.warning(f"Audio processing fell behind, dropped {w - r - max_lag} chunks")
+                r = w - max_lag
+                pre_buffer.clear()
+            
+            for i in range(r, w):
+                audio_chunk = ring[i % ring_slots]
+                try:
+                    # Calibration phase
+                    if calibrating:
+                        calibration_chunks += 1
+                        level = self.calculate_energy(audio_chunk)
+                        self._noise_sum += level
+                        self._noise_n += 1
+                        noise_window.append(level)
+                        
+                        if len(noise_window) == 16:
+                            levels = np.fromiter(noise_window, dtype=np.float64, count=16)
+                            settled = levels.std() <= 0.1 * levels.mean()
+                        else:
+                            settled = False
+                        if calibration_chunks >= calibration_total or settled:
+                            if self._noise_n:
+                                # Set energy threshold based on noise floor
+                                noise_floor = self._noise_sum / self._noise_n
+                                self.energy_threshold = max(0.005, noise_floor * 3)
+                                self._speech_gate = self._build_speech_gate()
+                                print(f"Calibration complete. Noise floor: {noise_floor:.4f}, Threshold: {self.energy_threshold:.4f}")
+                            self.calibrating = calibrating = False
+                        continue
                     
-                    if calibration_chunks >= calibration_total:
-                        if self.noise_levels:
-                            # Set energy threshold based on noise floor
-                            noise_floor = np.mean(list(self.noise_levels))
-                            self.energy_threshold = max(0.005, noise_floor * 3)
-                            print(f"Calibration complete. Noise floor: {noise_floor:.4f}, Threshold: {self.energy_threshold:.4f}")
-                        self.calibrating = False
-                    continue
-                
-                # Always add to pre-buffer when not speaking
-                if not is_speaking:
-                    self.pre_buffer.append(audio_chunk)
-                
-                if self.is_speech(audio_chunk):
-                    speech_count += 1
-                    if not is_speaking and speech_count >= self.consecutive_speech:
-                        print("\n[Listening...]", end='', flush=True)
-                        is_speaking = True
-                        # Add pre-buffer to speech frames to capture the beginning
-                        speech_frames.extend(list(self.pre_buffer))
-                        # Clear the pre-buffer
-                        self.pre_buffer.clear()
+                    # Always add to pre-buffer when not speaking
+                    if not is_speaking:
+                        pre_buffer.append(audio_chunk)
                     
-                    if is_speaking:
-                        speech_frames.append(audio_chunk)
-                    silence_count = 0
-                else:
-                    if is_speaking:
-                        silence_count += 1
-                        speech_frames.append(audio_chunk)
-                        
-                        # If enough silence, process the speech
-                        if silence_count >= self.silence_threshold:
-                            # Only process if we had enough speech chunks
-                            if len(speech_frames) >= self.min_speech_chunks:
-                                print(" [Processing...]", end='', flush=True)
-                                self.recognize_and_type(speech_frames)
-                            else:
-                                print(" [Too short, ignoring]")
-                            
-                            speech_frames = []
-                            silence_count = 0
-                            speech_count = 0
-                            is_speaking = False
+                    if is_speech(audio_chunk):
+                        speech_count += 1
+                        if not is_speaking and speech_count >= consecutive_speech:
+                            logger.debug("Speech started")
+                            is_speaking = True
+                            # Start from the pre-buffer to capture the beginning;
+                            # it already ends with the current chunk. One
+                            # concatenate writes it straight into the buffer.
+                            frame_len = len(pre_buffer) * chunk_size
+                            np.concatenate(pre_buffer, out=frame_buf[:frame_len])
+                            # Clear the pre-buffer
+                            pre_buffer.clear()
+                        elif is_speaking:
+                            append(audio_chunk)
+                        silence_count = 0
                     else:
-                        # Reset speech count if we get non-speech while not speaking
-                        speech_count = 0
+                        if is_speaking:
+                            silence_count += 1
+                            append(audio_chunk)
                             
-            except queue.Empty:
-                continue
-            except Exception as e:
-                print(f"\nError in audio processing: {e}")
+                            # If enough silence, process the speech
+                            if silence_count >= silence_threshold:
+                                # Only process if we had enough speech chunks
+                                if frame_len >= min_speech_samples:
+                                    logger.debug("Speech ended, queued %.2fs for transcription", frame_len / self.RATE)
+                                    # Copy out so the buffer can be reused for the next utterance
+                                    transcribe_put(frame_buf[:frame_len].copy())
+                                else:
+                                    logger.debug("Speech too short, ignoring %.2fs", frame_len / self.RATE)
+                                
+                                frame_len = 0
+                                silence_count = 0
+                                speech_count = 0
+                                is_speaking = False
+                        else:
+                            # Reset speech count if we get non-speech while not speaking
+                            speech_count = 0
+                                
+                except Exception as e:
+                    print(f"\nError in audio processing: {e}")
+            
+            self._ring_r = w
     
-    def recognize_and_type(self, audio_frames):
-        """Recognize speech and type it using keyboard simulation."""
+    def _transcribe_worker(self):
+        """Run Whisper on completed utterances off the audio processing thread."""
+        # Whisper pads every input to a 30 s window, so utterances that queued up
+        # while the model was busy are joined and transcribed in a single pass
+        max_batch_samples = self.RATE * 30
+        gap = np.zeros(int(self.RATE * 0.3), dtype=np.int16)
+        pending = None
+        
+        # Warm the model while calibration runs so the first real utterance does
+        # not pay for lazy allocation and kernel selection
         try:
-            # Convert audio frames to numpy array
-            audio_data = b''.join(audio_frames)
-            audio_np = np.frombuffer(audio_data, dtype=np.int16).astype(np.float32) / 32768.0
+            self._transcribe(np.zeros(self.RATE, dtype=np.float32))
+            logger.debug("Model warm-up complete")
+        except Exception as e:
+            logger.warning(f"Model warm-up failed: {e}")
+        
+        while self.running:
+            if pending is not None:
+                batch, pending = [pending], None
+            else:
+                try:
+                    batch = [self._transcribe_q.get(timeout=0.1)]
+                except queue.Empty:
+                    continue
             
-            # Additional check: ensure audio has sufficient energy
-            if np.max(np.abs(audio_np)) < 0.01:
+            total = len(batch[0])
+            while True:
+                try:
+                    audio_i16 = self._transcribe_q.get_nowait()
+                except queue.Empty:
+                    break
+                total += len(gap) + len(audio_i16)
+                if total > max_batch_samples:
+                    pending = audio_i16
+                    break
+                batch.append(audio_i16)
+            
+            if len(batch) > 1 and self._decode_opts is not None:
+                # The openai backend can batch the encoder itself, which keeps
+                # every utterance in its own window and result
+                logger.debug(f"Decoding {len(batch)} queued utterances as one batch")
+                self.recognize_and_type_batch(batch)
+            elif len(batch) > 1:
+                logger.debug(f"Batching {len(batch)} queued utterances into one transcription")
+                parts = [batch[0]]
+                for audio_i16 in batch[1:]:
+                    parts.append(gap)
+                    parts.append(audio_i16)
+                self.recognize_and_type(np.concatenate(parts))
+            else:
+                self.recognize_and_type(batch[0])
+    
+    def recognize_and_type(self, audio_i16):
+        """Recognize speech and type it using keyboard simulation."""
+        try:
+            # Ensure audio has sufficient energy (0.01 full scale) before paying
+            # for the float conversion
+            if _peak_below(audio_i16, 328):
                 print(" [Audio too quiet]")
                 return
             
-            # Transcribe with Whisper
-            whisper_config = self.config['whisper']
-            result = self.model.transcribe(
-                audio_np,
-                language=whisper_config['language'],
-                fp16=False,
-                temperature=whisper_config['temperature'],
-                no_speech_threshold=whisper_config['no_speech_threshold'],
-                logprob_threshold=whisper_config['logprob_threshold']
-            )
-            
-            text = result['text'].strip()
+            # Scale the int16 samples to float32, reusing the scratch buffer when it fits
+            n = len(audio_i16)
+            if n <= len(self._scratch_f32):
+                audio_np = self._scratch_f32[:n]
+                np.multiply(audio_i16, _INT16_SCALE, out=audio_np, casting='unsafe')
+            else:
+                audio_np = np.multiply(audio_i16, _INT16_SCALE, dtype=np.float32)
             
-            # Apply filtering
-            filter_config = self.config['filtering']
+            # Only short clips are cached; longer ones are unlikely to repeat
+            features = None
+            text = None
+            if self._cache_db is not None and n < self._cache_max_samples:
+                features = self._audio_features(audio_np)
+                # Length in 100 ms steps; only clips within one step are compared
+                duration = round(n * 10 / self.RATE)
+                if features is not None:
+                    text = self._cache_lookup(features, duration)
             
-            # Check against false positives
-            if text.lower() in [fp.lower() for fp in filter_config['false_positives']]:
-                print(" [Filtered: false positive]")
-                return
+            if text is not None:
+                logger.debug(f"Transcription cache hit: '{text}'")
+            else:
+                # Transcribe with Whisper
+                text = self._transcribe(audio_np)
+                if features is not None:
+                    self._cache_store(features, duration, text)
             
-            # Check minimum length
-            if len(text) < filter_config['min_text_length']:
-                print(" [Filtered: too short]")
-                return
+            self._filter_and_type(text)
+                
+        except Exception as e:
+            print(f"\nError in recognition: {e}")
+    
+    def recognize_and_type_batch(self, batch):
+        """Recognize several queued int16 utterances in one decode and type each result."""
+        try:
+            clips = []
+            for audio_i16 in batch:
+                if _peak_below(audio_i16, 328):
+                    print(" [Audio too quiet]")
+                    continue
+                audio_np = np.multiply(audio_i16, _INT16_SCALE, dtype=np.float32)
+                clips.append(audio_np)
             
-            # If all checks pass, type the text
-            print(f" [{text}]")
-            self.keyboard_controller.type(text + " ")
+            if clips:
+                for text in self._decode_batch(clips):
+                    self._filter_and_type(text)
                 
         except Exception as e:
             print(f"\nError in recognition: {e}")
     
+    def _filter_and_type(self, text):
+        """Drop false positives and fragments, then type the text."""
+        # Apply filtering: check against false positives
+        if text.lower() in self._false_positives:
+            print(" [Filtered: false positive]")
+            return
+        
+        # Check minimum length
+        if len(text) < self._min_text_length:
+            print(" [Filtered: too short]")
+            return
+        
+        # If all checks pass, type the text
+        print(f" [{text}]")
+        self._type_text(text + " ")
+    
+    def _type_text(self, text):
+        """Type text via clipboard paste, native injection or pynput, in that order."""
+        typing_config = self.config['typing']
+        
+        # pynput sends one key event per character; a single paste is much
+        # faster for long sentences but temporarily replaces the clipboard
+        if typing_config['clipboard_paste'] and len(text) > typing_config['paste_min_length']:
+            try:
+                import pyperclip
+                
+                previous = pyperclip.paste()
+                pyperclip.copy(text)
+                paste_key = Key.cmd if PLATFORM == "Darwin" else Key.ctrl
+                with self.keyboard_controller.pressed(paste_key):
+                    self.keyboard_controller.press('v')
+                    self.keyboard_controller.release('v')
+                # Give the target application time to read the clipboard before restoring it
+                time.sleep(0.1)
+                pyperclip.copy(previous)
+                return
+            except ImportError:
+                logger.warning("pyperclip not available, disabling clipboard paste. Install with: pip install pyperclip")
+                typing_config['clipboard_paste'] = False
+            except Exception as e:
+                logger.warning(f"Clipboard paste failed, typing instead: {e}")
+        
+        if typing_config['native_injection']:
+            try:
+                if inject_text(text):
+                    return
+            except Exception as e:
+                logger.warning(f"Native text injection failed, using pynput: {e}")
+        
+        self.keyboard_controller.type(text)
+    
     def setup_hotkeys(self):
         """Set up keyboard hotkeys."""
         def on_press(key):
@@ -407,6 +1178,7 @@ class SpeechToKeyboard:
         print(f"  Silence threshold: {self.silence_threshold} chunks (~{self.silence_threshold * 30}ms)")
         print(f"  Min speech duration: {self.min_speech_chunks} chunks (~{self.min_speech_chunks * 30}ms)")
         print(f"  Model: {self.config['whisper']['model_size']}")
+        print(f"  Backend: {self.backend} ({self.device}, {self.compute_type})")
         print(f"  Language: {self.config['whisper']['language']}")
         print()
         
@@ -420,17 +1192,27 @@ class SpeechToKeyboard:
         audio_thread = threading.Thread(target=self.process_audio, daemon=True)
         audio_thread.start()
         
+        # Start transcription thread so Whisper never stalls audio processing
+        transcribe_thread = threading.Thread(target=self._transcribe_worker, daemon=True)
+        transcribe_thread.start()
+        
         try:
-            # Keep the main thread alive
-            while self.running:
-                time.sleep(0.1)
+            # Block the main thread until shutdown instead of polling. Ctrl+C
+            # interrupts the wait on Linux/macOS, but Windows only delivers it
+            # between bytecodes, so wake up periodically there.
+            wait_timeout = 0.5 if PLATFORM == "Windows" else None
+            while not self._shutdown.wait(wait_timeout):
+                pass
         except KeyboardInterrupt:
             print("\n\nShutting down...")
         finally:
+            self._shutdown.set()
             self.running = False
             self.stop_audio_stream()
             if self.audio:
                 self.audio.terminate()
+            if self._cache_db is not None:
+                self._cache_db.close()
             hotkey_listener.stop()
             print("Goodbye!")
 
@@ -441,30 +1223,43 @@ def kill_existing_instances():
     
     try:
         # Find all python processes running speech_to_keyboard
-        result = subprocess.run(
-            ["pgrep", "-f", "python.*speech_to_keyboard"],
-            capture_output=True,
-            text=True
-        )
+        if os.path.isdir('/proc'):
+            # Read /proc directly rather than forking pgrep
+            pids = []
+            for pid_dir in os.listdir('/proc'):
+                if not pid_dir.isdigit():
+                    continue
+                try:
+                    with open(f'/proc/{pid_dir}/cmdline', 'rb') as f:
+                        cmd = f.read().replace(b'\0', b' ').decode(errors='ignore')
+                except OSError:
+                    # Process exited while scanning
+                    continue
+                if 'python' in cmd and 'speech_to_keyboard' in cmd:
+                    pids.append(int(pid_dir))
+        else:
+            # No /proc (macOS); pgrep raises FileNotFoundError on Windows
+            result = subprocess.run(
+                ["pgrep", "-f", "python.*speech_to_keyboard"],
+                capture_output=True,
+                text=True
+            )
+            pids = [int(pid_str) for pid_str in result.stdout.split()] if result.returncode == 0 else []
         
-        if result.returncode == 0:
-            pids = result.stdout.strip().split('\n')
-            for pid_str in pids:
-                if pid_str:
-                    pid = int(pid_str)
-                    # Don't kill ourselves
-                    if pid != current_pid:
-                        try:
-                            os.kill(pid, signal.SIGTERM)
-                            logger.info(f"Killed existing instance with PID {pid}")
-                            print(f"Killed existing instance (PID: {pid})")
-                            # Give it a moment to clean up
-                            time.sleep(0.5)
-                        except ProcessLookupError:
-                            # Process already gone
-                            pass
-                        except Exception as e:
-                            logger.warning(f"Failed to kill PID {pid}: {e}")
+        for pid in pids:
+            # Don't kill ourselves
+            if pid != current_pid:
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                    logger.info(f"Killed existing instance with PID {pid}")
+                    print(f"Killed existing instance (PID: {pid})")
+                    # Give it a moment to clean up
+                    time.sleep(0.5)
+                except ProcessLookupError:
+                    # Process already gone
+                    pass
+                except Exception as e:
+                    logger.warning(f"Failed to kill PID {pid}: {e}")
     except FileNotFoundError:
         # pgrep not available (Windows), try alternative method
         if PLATFORM == "Windows":
@@ -491,8 +1286,15 @@ def main():
     parser = argparse.ArgumentParser(description="Enhanced Speech-to-Text Keyboard")
     parser.add_argument("--config", default="speech_config.json", 
                         help="Path to configuration file (default: speech_config.json)")
+    parser.add_argument("--verbose", action="store_true",
+                        help="Log speech start/end transitions (debug logging)")
     args = parser.parse_args()
     
+    if args.verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
+    
+    signal.signal(signal.SIGTERM, _exit_on_sigterm)
+    
     # Kill any existing instances before starting
     kill_existing_instances()
     
@@ -27,20 +27,19 @@ Cross-platform: Works on Linux and Windows
 import sys
 import time
 import threading
-import queue
+import concurrent.futures
 import numpy as np
 import pyaudio
-import whisper
 from pynput import keyboard
 from pynput.keyboard import Controller, Key
 import argparse
 import json
 import os
-from collections import deque
 import platform
 import webrtcvad
 import subprocess
 import signal
+import shutil
 
 # Detect platform
 PLATFORM = platform.system()
@@ -62,11 +61,90 @@ if PLATFORM == "Linux":
     except Exception:
         pass
 
+# Scale factor from int16 PCM samples to float32 in [-1, 1)
+_INT16_SCALE = np.float32(1.0 / 32768.0)
+
+def _peak_below(audio_i16, threshold):
+    """Return True if no int16 sample reaches +/-threshold.
+    
+    Scans in blocks and stops at the first loud one, so speech is usually
+    accepted after the first half second instead of a full pass over the clip.
+    """
+    for start in range(0, len(audio_i16), 8192):
+        block = audio_i16[start:start + 8192]
+        if block.max() >= threshold or block.min() <= -threshold:
+            return False
+    return True
+
+# Native text injection. pynput sends every character as its own OS event;
+# these paths hand the whole string to the OS in one call instead.
+_XDOTOOL = shutil.which("xdotool") if PLATFORM == "Linux" and os.environ.get("DISPLAY") else None
+
+if PLATFORM == "Windows":
+    import ctypes
+    from ctypes import wintypes
+    
+    INPUT_KEYBOARD = 1
+    KEYEVENTF_KEYUP = 0x0002
+    KEYEVENTF_UNICODE = 0x0004
+    
+    class _KEYBDINPUT(ctypes.Structure):
+        _fields_ = [("wVk", wintypes.WORD), ("wScan", wintypes.WORD), ("dwFlags", wintypes.DWORD),
+                    ("time", wintypes.DWORD), ("dwExtraInfo", ctypes.c_size_t)]
+    
+    class _MOUSEINPUT(ctypes.Structure):
+        # Only here so the union, and therefore INPUT, has the size SendInput expects
+        _fields_ = [("dx", wintypes.LONG), ("dy", wintypes.LONG), ("mouseData", wintypes.DWORD),
+                    ("dwFlags", wintypes.DWORD), ("time", wintypes.DWORD), ("dwExtraInfo", ctypes.c_size_t)]
+    
+    class _INPUTUNION(ctypes.Union):
+        _fields_ = [("ki", _KEYBDINPUT), ("mi", _MOUSEINPUT)]
+    
+    class _INPUT(ctypes.Structure):
+        _fields_ = [("type", wintypes.DWORD), ("u", _INPUTUNION)]
+
+def inject_text(text):
+    """Type text through the platform input API in one call.
+    
+    Returns False when no native path is available so the caller can fall
+    back to pynput.
+    """
+    if PLATFORM == "Windows":
+        # One key-down/key-up pair per UTF-16 code unit, all in a single SendInput
+        units = text.encode('utf-16-le')
+        codes = [int.from_bytes(units[i:i + 2], 'little') for i in range(0, len(units), 2)]
+        inputs = (_INPUT * (2 * len(codes)))()
+        for i, code in enumerate(codes):
+            for j, flags in enumerate((KEYEVENTF_UNICODE, KEYEVENTF_UNICODE | KEYEVENTF_KEYUP)):
+                event = inputs[2 * i + j]
+                event.type = INPUT_KEYBOARD
+                event.u.ki.wScan = code
+                event.u.ki.dwFlags = flags
+        sent = ctypes.windll.user32.SendInput(len(inputs), inputs, ctypes.sizeof(_INPUT))
+        return sent == len(inputs)
+    
+    if _XDOTOOL:
+        subprocess.run([_XDOTOOL, "type", "--delay", "0", "--", text], check=True)
+        return True
+    
+    return False
+
 class LiteSpeechKeyboard:
-    def __init__(self, model_size="tiny", language="en"):
+    def __init__(self, model_size="tiny", language="en", paste=False):
         """Initialize the lightweight speech keyboard."""
-        print(f"Loading Whisper {model_size} model...")
-        self.model = whisper.load_model(model_size)
+        # Prefer faster-whisper's int8 CTranslate2 kernels, fall back to openai-whisper
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError:
+            import whisper
+            print(f"Loading Whisper {model_size} model...")
+            self.model = whisper.load_model(model_size, device="cpu")
+            self.faster_whisper = False
+            self._quantize_model()
+        else:
+            print(f"Loading faster-whisper {model_size} model...")
+            self.model = WhisperModel(model_size, device="cpu", compute_type="int8", cpu_threads=os.cpu_count())
+            self.faster_whisper = True
         self.language = language
         
         # Audio settings
@@ -84,70 +162,251 @@ class LiteSpeechKeyboard:
         
         # Keyboard controller
         self.keyboard_controller = Controller()
+        # Paste through the clipboard instead of typing (clobbers it briefly)
+        self.paste = paste
         
         # State
         self.listening = False
         self.running = True
-        self.audio_queue = queue.Queue()
+        # Set while listening, so the main loop can block instead of polling
+        self._listening_event = threading.Event()
         
         # Simplified settings
-        self.silence_threshold = 15  # ~450ms
+        self.silence_threshold = 17  # ~500ms of silence ends an utterance
         self.min_speech_chunks = 10  # ~300ms
+        self.max_utterance_seconds = 20
         
-        # Pre-buffer for better speech capture
-        self.pre_buffer = deque(maxlen=10)  # ~300ms pre-buffer
+        # Pre-buffer for better speech capture: audio just before the first
+        # voiced frame is taken from the ring buffer
+        self.pre_buffer_chunks = 10  # ~300ms pre-buffer
+        
+        # Ring buffer of the last 30 s of audio, written by the PortAudio callback.
+        # _write_pos only moves forward in the callback. _read_pos advances in
+        # record_and_transcribe and is reset to _write_pos by toggle_listening
+        # when listening starts; the callback never reads it, so no lock is needed.
+        self._buf = np.zeros(self.RATE * 30, dtype=np.int16)
+        self._write_pos = 0
+        self._read_pos = 0
+        # The callback runs on PortAudio's thread and must never block, so its
+        # return value is built once and overruns are only counted there
+        self._pa_continue = (None, pyaudio.paContinue)
+        self._overflows = 0
+        # Set by the callback after every write so the reader can sleep until then
+        self._data_ready = threading.Event()
+        
+        # Utterance limits in samples, fixed for the lifetime of the app
+        self._max_utt_samples = self.RATE * self.max_utterance_seconds
+        self._pre_samples = self.pre_buffer_chunks * self.CHUNK
+        
+        # Whisper runs on a single decoder thread so the next utterance keeps
+        # being captured while the previous one is transcribed
+        self._decoder = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self._decoding = None
+        # float32 copy of the utterance handed to Whisper; only the decoder thread uses it
+        self._audio_scratch = np.empty(self.RATE * self.max_utterance_seconds, dtype=np.float32)
+        # Warm up on the decoder thread while the user gets ready; the first
+        # utterance waits for it through the usual backpressure
+        self._decoding = self._decoder.submit(self._warm_up)
         
         # Simple false positive filter
-        self.false_positives = {"", ".", "!", "?", "Thank you.", "Thanks.", "thank you", "you"}
+        self.false_positives = frozenset({"", ".", "!", "?", "thank you.", "thanks.", "thank you", "you"})
         
         # Track last typed text for proper spacing
         self.last_typed_text = ""
         
         print("Model loaded!")
 
+    def _quantize_model(self):
+        """Quantize the openai-whisper model's linear layers to int8 for CPU inference."""
+        try:
+            import torch
+            
+            # whisper subclasses nn.Linear only to cast weights for FP16, which
+            # never happens on CPU. quantize_dynamic matches exact types, so turn
+            # them back into plain nn.Linear first.
+            for module in self.model.modules():
+                if isinstance(module, torch.nn.Linear):
+                    module.__class__ = torch.nn.Linear
+            torch.quantization.quantize_dynamic(
+                self.model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+            )
+            print("Quantized model weights to int8")
+        except Exception as e:
+            # e.g. no quantized engine for this CPU; FP32 still works
+            print(f"int8 quantization unavailable, using FP32: {e}")
+    
     def toggle_listening(self):
         """Toggle listening state."""
         self.listening = not self.listening
         
         if self.listening:
+            self._listening_event.set()
             print("\n🎤 LISTENING...")
+            # Skip whatever was captured before this session
+            self._read_pos = self._write_pos
+            self._overflows = 0
             self.stream = self.audio.open(
                 format=self.FORMAT,
                 channels=self.CHANNELS,
                 rate=self.RATE,
                 input=True,
-                frames_per_buffer=self.CHUNK
+                frames_per_buffer=self.CHUNK,
+                stream_callback=self.audio_callback
             )
         else:
             print("\n⏸️  PAUSED")
+            self._listening_event.clear()
+            # Wake record_and_transcribe so it notices right away
+            self._data_ready.set()
+            if self._overflows:
+                print(f"Warning: audio input overflowed {self._overflows} times; some audio was lost")
             if self.stream:
                 self.stream.stop_stream()
                 self.stream.close()
                 self.stream = None
     
-    def recognize_and_type(self, audio_frames):
-        """Recognize speech and type it."""
-        try:
-            audio_data = b''.join(audio_frames)
-            audio_np = np.frombuffer(audio_data, dtype=np.int16).astype(np.float32) / 32768.0
+    def audio_callback(self, in_data, frame_count, time_info, status):
+        """Copy captured audio into the ring buffer."""
+        if status & pyaudio.paInputOverflow:
+            self._overflows += 1
+        samples = np.frombuffer(in_data, dtype=np.int16)
+        size = len(self._buf)
+        start = self._write_pos % size
+        end = start + len(samples)
+        if end <= size:
+            self._buf[start:end] = samples
+        else:
+            split = size - start
+            self._buf[start:] = samples[:split]
+            self._buf[:end - size] = samples[split:]
+        self._write_pos += len(samples)
+        self._data_ready.set()
+        return self._pa_continue
+    
+    def _read_samples(self, start, n):
+        """Return n samples from ring position start (a view unless it wraps)."""
+        size = len(self._buf)
+        offset = start % size
+        if offset + n <= size:
+            return self._buf[offset:offset + n]
+        return np.concatenate((self._buf[offset:], self._buf[:offset + n - size]))
+    
+    def record_and_transcribe(self):
+        """Capture one utterance, ending it after ~500ms of silence, and transcribe it."""
+        frame = self.CHUNK
+        max_samples = self._max_utt_samples
+        pre_samples = self._pre_samples
+        data_ready = self._data_ready
+        
+        # If transcription fell so far behind that an utterance could be
+        # overwritten before it ends, skip ahead to live audio
+        pos = self._read_pos
+        if self._write_pos - pos > len(self._buf) - max_samples - pre_samples:
+            pos = self._write_pos
+        first = pos
+        
+        start = None  # ring position where the utterance begins
+        voiced = 0
+        silence_frames = 0
+        
+        while self.listening:
+            if self._write_pos - pos < frame:
+                data_ready.wait(0.1)
+                data_ready.clear()
+                continue
             
-            # Simple energy check
-            if np.max(np.abs(audio_np)) < 0.01:
-                print(" [Too quiet]", end='', flush=True)
-                return
+            # webrtcvad takes the frame as raw bytes
+            is_speech = self.vad.is_speech(self._read_samples(pos, frame).view(np.uint8), self.RATE)
+            pos += frame
             
-            # Transcribe with minimal options for speed
-            result = self.model.transcribe(
+            if is_speech:
+                if start is None:
+                    start = max(pos - frame - pre_samples, first)
+                voiced += 1
+                silence_frames = 0
+            elif start is not None:
+                silence_frames += 1
+                if silence_frames >= self.silence_threshold:
+                    if voiced >= self.min_speech_chunks:
+                        break
+                    # Too little speech to be worth transcribing; keep listening
+                    start = None
+                    voiced = 0
+                    silence_frames = 0
+            
+            if start is not None and pos - start >= max_samples:
+                # The frame that crossed the cap may overshoot it; leave the
+                # excess for the next utterance so the clip fits _audio_scratch
+                pos = start + max_samples
+                break
+        else:
+            # Listening stopped before the silence endpoint. Stopping right after
+            # the last sentence is the normal way to pause, so keep the utterance,
+            # including audio captured but not yet checked by the VAD.
+            if start is not None and voiced >= self.min_speech_chunks:
+                pos = min(self._write_pos, start + max_samples)
+            else:
+                start = None
+        
+        self._read_pos = pos
+        if start is None:
+            return
+        
+        audio_i16 = self._read_samples(start, pos - start).copy()
+        
+        # Backpressure: keep at most one utterance in flight. Waiting here is
+        # safe because the callback keeps capturing into the ring meanwhile.
+        if self._decoding is not None:
+            self._decoding.result()
+        self._decoding = self._decoder.submit(self.recognize_and_type, audio_i16)
+    
+    def _transcribe(self, audio_np):
+        """Transcribe float32 audio with minimal options for speed."""
+        if self.faster_whisper:
+            segments, _ = self.model.transcribe(
                 audio_np,
                 language=self.language,
-                fp16=False,
+                beam_size=1,
+                vad_filter=False,
+                condition_on_previous_text=False,
+                without_timestamps=True,
                 temperature=0.0  # Deterministic
             )
+            return "".join(segment.text for segment in segments).strip()
+        
+        result = self.model.transcribe(
+            audio_np,
+            language=self.language,
+            fp16=False,
+            condition_on_previous_text=False,
+            without_timestamps=True,
+            temperature=0.0  # Deterministic
+        )
+        return result['text'].strip()
+    
+    def _warm_up(self):
+        """Run one silent transcription so the first utterance doesn't pay for lazy setup."""
+        try:
+            self._transcribe(np.zeros(self.RATE, dtype=np.float32))
+        except Exception as e:
+            print(f"\nWarm-up failed: {e}")
+    
+    def recognize_and_type(self, audio_i16):
+        """Recognize speech and type it."""
+        try:
+            # Simple energy check on the raw samples (0.01 full scale)
+            if _peak_below(audio_i16, 328):
+                print(" [Too quiet]", end='', flush=True)
+                return
+            
+            # Convert and scale in one pass, straight into the scratch buffer
+            audio_np = self._audio_scratch[:len(audio_i16)]
+            np.multiply(audio_i16, _INT16_SCALE, out=audio_np, casting='unsafe')
             
-            text = result['text'].strip()
+            text = self._transcribe(audio_np)
             
             # Simple filtering
-            if text and text not in self.false_positives and len(text) > 2:
+            if text and text.lower() not in self.false_positives and len(text) > 2:
                 # Check if we need to add a space before this text
                 text_to_type = text
                 if self.last_typed_text:
@@ -158,7 +417,14 @@ class LiteSpeechKeyboard:
                         text_to_type = ' ' + text
                 
                 print(f" [{text}]", end='', flush=True)
-                self.keyboard_controller.type(text_to_type)
+                typed = self.paste and self._paste_text(text_to_type)
+                if not typed:
+                    try:
+                        typed = inject_text(text_to_type)
+                    except Exception:
+                        typed = False
+                if not typed:
+                    self.keyboard_controller.type(text_to_type)
                 # Update last typed text
                 self.last_typed_text = text
             else:
@@ -167,6 +433,29 @@ class LiteSpeechKeyboard:
         except Exception as e:
             print(f"\nError: {e}")
     
+    def _paste_text(self, text):
+        """Put text on the clipboard and send a single paste, restoring the clipboard after."""
+        try:
+            import pyperclip
+        except ImportError:
+            print("\npyperclip not available, typing instead. Install with: pip install pyperclip")
+            self.paste = False
+            return False
+        try:
+            previous = pyperclip.paste()
+            pyperclip.copy(text)
+            paste_key = Key.cmd if PLATFORM == "Darwin" else Key.ctrl
+            with self.keyboard_controller.pressed(paste_key):
+                self.keyboard_controller.press('v')
+                self.keyboard_controller.release('v')
+            # Give the target application time to read the clipboard before restoring it
+            time.sleep(0.1)
+            pyperclip.copy(previous)
+            return True
+        except Exception as e:
+            print(f"\nClipboard paste failed, typing instead: {e}")
+            return False
+    
     def run(self):
         """Main loop."""
         # Set up hotkey
@@ -187,10 +476,10 @@ class LiteSpeechKeyboard:
         
         try:
             while self.running:
-                if self.listening:
-                    self.recognize_and_type(self.pre_buffer)
-                else:
-                    time.sleep(0.1)
+                # Time out periodically so running=False is noticed while paused,
+                # and Ctrl+C works on Windows where Event.wait() isn't interruptible
+                if self._listening_event.wait(0.5):
+                    self.record_and_transcribe()
                     
         except KeyboardInterrupt:
             print("\n\nShutting down...")
@@ -199,6 +488,7 @@ class LiteSpeechKeyboard:
             if self.stream:
                 self.stream.stop_stream()
                 self.stream.close()
+            self._decoder.shutdown(wait=True)
             self.audio.terminate()
             listener.stop()
 
@@ -209,29 +499,42 @@ def kill_existing_instances():
     
     try:
         # Find all python processes running speech_to_keyboard
-        result = subprocess.run(
-            ["pgrep", "-f", "python.*speech_to_keyboard"],
-            capture_output=True,
-            text=True
-        )
+        if os.path.isdir('/proc'):
+            # Read /proc directly rather than forking pgrep
+            pids = []
+            for pid_dir in os.listdir('/proc'):
+                if not pid_dir.isdigit():
+                    continue
+                try:
+                    with open(f'/proc/{pid_dir}/cmdline', 'rb') as f:
+                        cmd = f.read().replace(b'\0', b' ').decode(errors='ignore')
+                except OSError:
+                    # Process exited while scanning
+                    continue
+                if 'python' in cmd and 'speech_to_keyboard' in cmd:
+                    pids.append(int(pid_dir))
+        else:
+            # No /proc (macOS); pgrep raises FileNotFoundError on Windows
+            result = subprocess.run(
+                ["pgrep", "-f", "python.*speech_to_keyboard"],
+                capture_output=True,
+                text=True
+            )
+            pids = [int(pid_str) for pid_str in result.stdout.split()] if result.returncode == 0 else []
         
-        if result.returncode == 0:
-            pids = result.stdout.strip().split('\n')
-            for pid_str in pids:
-                if pid_str:
-                    pid = int(pid_str)
-                    # Don't kill ourselves
-                    if pid != current_pid:
-                        try:
-                            os.kill(pid, signal.SIGTERM)
-                            print(f"Killed existing instance (PID: {pid})")
-                            # Give it a moment to clean up
-                            time.sleep(0.5)
-                        except ProcessLookupError:
-                            # Process already gone
-                            pass
-                        except Exception as e:
-                            print(f"Failed to kill PID {pid}: {e}")
+        for pid in pids:
+            # Don't kill ourselves
+            if pid != current_pid:
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                    print(f"Killed existing instance (PID: {pid})")
+                    # Give it a moment to clean up
+                    time.sleep(0.5)
+                except ProcessLookupError:
+                    # Process already gone
+                    pass
+                except Exception as e:
+                    print(f"Failed to kill PID {pid}: {e}")
     except FileNotFoundError:
         # pgrep not available (Windows), try alternative method
         if PLATFORM == "Windows":
@@ -266,6 +569,11 @@ def main():
         default="en",
         help="Language for Whisper model (default: en)"
     )
+    parser.add_argument(
+        "--paste",
+        action="store_true",
+        help="Paste each transcript through the clipboard instead of typing it"
+    )
     
     args = parser.parse_args()
     
@@ -274,7 +582,8 @@ def main():
     
     app = LiteSpeechKeyboard(
         model_size=args.model,
-        language=args.language
+        language=args.language,
+        paste=args.paste
     )
     app.run()
 
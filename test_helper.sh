@@ -192,7 +192,7 @@ run_basic_test() {
     timeout 10 python3 -c "
 import sys
 sys.path.insert(0, '.')
-from speech_to_keyboard_lite import SimpleSpeechKeyboard
+from speech_to_keyboard_lite import LiteSpeechKeyboard
 import time
 import threading
 
@@ -201,7 +201,7 @@ def stop_after_delay(app, delay=10):
     app.running = False
     print('\nTest completed!')
 
-app = SimpleSpeechKeyboard(model_size='tiny')
+app = LiteSpeechKeyboard(model_size='tiny')
 stop_thread = threading.Thread(target=stop_after_delay, args=(app, 10))
 stop_thread.start()
 
@@ -8,7 +8,6 @@ import pyaudio
 import webrtcvad
 import numpy as np
 from collections import deque
-import time
 import json
 import os
 
@@ -57,46 +56,53 @@ def test_prebuffer():
     speech_count = 0
     is_speaking = False
     
+    # Chunks are read and measured 16 at a time (~480ms); RMS for the whole
+    # batch is one NumPy call, only VAD has to run per 30ms frame
+    BATCH = 16
+    chunk_bytes = CHUNK * 2  # 16-bit samples
+    
     try:
         while True:
-            # Read audio chunk
-            audio_chunk = stream.read(CHUNK, exception_on_overflow=False)
-            chunk_count += 1
-            
-            # Calculate energy
-            audio_np = np.frombuffer(audio_chunk, dtype=np.int16).astype(np.float32) / 32768.0
-            energy = np.sqrt(np.mean(audio_np ** 2))
-            
-            # Check for speech
-            try:
-                is_speech = vad.is_speech(audio_chunk, RATE) and energy > 0.01
-            except:
-                is_speech = False
-            
-            # Visualize current state
-            if is_speech:
-                marker = "█" * int(energy * 100)
-                print(f"Chunk {chunk_count:4d}: SPEECH {marker}")
-                speech_count += 1
-            else:
-                marker = "░" * int(energy * 100) if energy > 0.005 else ""
-                print(f"Chunk {chunk_count:4d}: silence {marker}")
-                speech_count = 0
-            
-            # Show when detection would trigger
-            if not is_speaking and speech_count >= config['speech_detection']['speech_detection_threshold']:
-                print(f"\n>>> SPEECH DETECTED! Pre-buffer contains {len(pre_buffer)} chunks")
-                print(f">>> This captures ~{len(pre_buffer) * 30}ms of audio before detection\n")
-                is_speaking = True
-            elif is_speaking and speech_count == 0:
-                is_speaking = False
-                print("\n>>> Speech ended\n")
+            # Read a batch of audio chunks
+            audio_block = stream.read(CHUNK * BATCH, exception_on_overflow=False)
             
-            # Update pre-buffer
-            if not is_speaking:
-                pre_buffer.append(audio_chunk)
+            # Calculate energy of every chunk at once
+            x = np.frombuffer(audio_block, dtype=np.int16).reshape(BATCH, CHUNK).astype(np.float32)
+            x *= np.float32(1.0 / 32768.0)
+            energies = np.sqrt(np.einsum('ij,ij->i', x, x) / CHUNK)
             
-            time.sleep(0.001)  # Small delay for readability
+            for i, energy in enumerate(energies):
+                audio_chunk = audio_block[i * chunk_bytes:(i + 1) * chunk_bytes]
+                chunk_count += 1
+                
+                # Check for speech
+                try:
+                    is_speech = vad.is_speech(audio_chunk, RATE) and energy > 0.01
+                except:
+                    is_speech = False
+                
+                # Visualize current state
+                if is_speech:
+                    marker = "█" * int(energy * 100)
+                    print(f"Chunk {chunk_count:4d}: SPEECH {marker}")
+                    speech_count += 1
+                else:
+                    marker = "░" * int(energy * 100) if energy > 0.005 else ""
+                    print(f"Chunk {chunk_count:4d}: silence {marker}")
+                    speech_count = 0
+                
+                # Show when detection would trigger
+                if not is_speaking and speech_count >= config['speech_detection']['speech_detection_threshold']:
+                    print(f"\n>>> SPEECH DETECTED! Pre-buffer contains {len(pre_buffer)} chunks")
+                    print(f">>> This captures ~{len(pre_buffer) * 30}ms of audio before detection\n")
+                    is_speaking = True
+                elif is_speaking and speech_count == 0:
+                    is_speaking = False
+                    print("\n>>> Speech ended\n")
+                
+                # Update pre-buffer
+                if not is_speaking:
+                    pre_buffer.append(audio_chunk)
             
     except KeyboardInterrupt:
         print("\n\nTest complete!")
@@ -8,10 +8,17 @@ Cross-platform: Works on Linux and Windows
 import sys
 import platform
 import time
+import argparse
+import io
+import threading
+import concurrent.futures
 import numpy as np
 import os
 from pathlib import Path
 
+# 1 second of silence for the Whisper model test, allocated once
+_WARMUP_AUDIO = np.zeros(16000, dtype=np.float32)
+
 # Detect platform
 PLATFORM = platform.system()
 print(f"Running tests on {PLATFORM}")
@@ -39,10 +46,15 @@ def test_imports():
         'pydub'
     ]
     
+    # Import side by side: per-module import locks let the extension loads
+    # (whisper pulls in torch) overlap, and results are reported in order
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(required_packages)) as executor:
+        futures = [(package, executor.submit(__import__, package)) for package in required_packages]
+    
     failed = []
-    for package in required_packages:
+    for package, future in futures:
         try:
-            __import__(package)
+            future.result()
             print(f"   ✓ {package} imported successfully")
         except ImportError as e:
             print(f"   ✗ Failed to import {package}: {e}")
@@ -87,14 +99,35 @@ def test_audio_devices():
         print(f"   ✗ Audio device test failed: {e}")
         return False
 
-def test_microphone_access():
-    """Test if microphone can be accessed."""
+def test_microphone_access(full=False):
+    """Test if microphone can be accessed.
+    
+    By default this only asks PortAudio whether the default input device
+    supports the format the app records in; full=True opens a stream and
+    reads from it.
+    """
     print("\n3. Testing microphone access...")
     try:
         import pyaudio
         
         p = pyaudio.PyAudio()
         
+        if not full:
+            try:
+                device = p.get_default_input_device_info()
+                # Raises ValueError if the format is not supported
+                p.is_format_supported(
+                    16000,
+                    input_device=device['index'],
+                    input_channels=1,
+                    input_format=pyaudio.paInt16
+                )
+            finally:
+                p.terminate()
+            print("   ✓ Default input device supports 16 kHz mono audio")
+            print("   (run with --full to record from the microphone)")
+            return True
+        
         # Try to open a stream
         stream = p.open(
             format=pyaudio.paInt16,
@@ -124,18 +157,73 @@ def test_microphone_access():
 def test_whisper_model():
     """Test if Whisper model can be loaded."""
     print("\n4. Testing Whisper model loading...")
+    # faster-whisper is optional; when installed it is what the lite and
+    # enhanced versions load. speech_to_keyboard.py and the commands version
+    # always use openai-whisper, so that backend is checked below either way.
+    try:
+        from faster_whisper import WhisperModel
+    except ImportError:
+        WhisperModel = None
+    
+    faster_whisper_ok = True
+    if WhisperModel is not None:
+        try:
+            print("   Loading faster-whisper tiny model (int8) for testing...")
+            model = WhisperModel("tiny", device="cpu", compute_type="int8")
+            segments, _ = model.transcribe(_WARMUP_AUDIO, beam_size=1, vad_filter=False)
+            # Segments are produced lazily; asking for the first one runs the model
+            next(iter(segments), None)
+            print("   ✓ faster-whisper model loaded and working")
+        except Exception as e:
+            print(f"   ✗ faster-whisper model test failed: {e}")
+            faster_whisper_ok = False
+    
     try:
+        import torch
         import whisper
         
+        # load_model("tiny") re-hashes the cached checkpoint on every call;
+        # loading the file by path skips that once it has been downloaded
+        cache_dir = os.path.join(
+            os.getenv("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "whisper"
+        )
+        cached_model = os.path.join(cache_dir, "tiny.pt")
+        
         print("   Loading tiny model for testing...")
-        model = whisper.load_model("tiny")
+        if os.path.isfile(cached_model):
+            model = whisper.load_model(cached_model, device="cpu")
+        else:
+            model = whisper.load_model("tiny", device="cpu")
+        
+        # Same int8 dynamic quantization the lite version applies on CPU; it
+        # also makes the test transcription below cheaper
+        try:
+            # quantize_dynamic matches exact types, and whisper subclasses nn.Linear
+            for module in model.modules():
+                if isinstance(module, torch.nn.Linear):
+                    module.__class__ = torch.nn.Linear
+            torch.quantization.quantize_dynamic(
+                model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+            )
+            print("   ✓ Quantized model weights to int8")
+        except Exception as e:
+            print(f"   ⚠ int8 quantization unavailable, testing FP32: {e}")
         
-        # Test with a dummy audio array
-        dummy_audio = np.zeros(16000, dtype=np.float32)  # 1 second of silence
-        result = model.transcribe(dummy_audio, fp16=False)
+        # One encoder pass over a silent window shows the weights load and run;
+        # transcribe() would add the autoregressive decoder loop on top
+        mel = whisper.log_mel_spectrogram(
+            whisper.pad_or_trim(_WARMUP_AUDIO), n_mels=model.dims.n_mels
+        )
+        with torch.no_grad():
+            features = model.embed_audio(mel.unsqueeze(0))
+        
+        expected_shape = (1, model.dims.n_audio_ctx, model.dims.n_audio_state)
+        if tuple(features.shape) != expected_shape:
+            print(f"   ✗ Unexpected encoder output shape: {tuple(features.shape)}")
+            return False
         
         print("   ✓ Whisper model loaded and working")
-        return True
+        return faster_whisper_ok
         
     except Exception as e:
         print(f"   ✗ Whisper model test failed: {e}")
@@ -206,32 +294,92 @@ def test_configuration():
     
     return True  # Config files are optional
 
+class ThreadOutput:
+    """Stand-in for sys.stdout that buffers what worker threads print.
+    
+    redirect_stdout swaps sys.stdout for the whole process, so tests running
+    side by side need their output split by thread instead.
+    """
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self.buffers = {}
+    
+    def write(self, text):
+        return self.buffers.get(threading.get_ident(), self.stream).write(text)
+    
+    def flush(self):
+        self.stream.flush()
+
+def run_test(test_name, test_func):
+    """Run one test, treating an unexpected exception as a failure."""
+    try:
+        return test_func()
+    except Exception as e:
+        print(f"\n✗ {test_name} test crashed: {e}")
+        return False
+
+def run_group(output, group):
+    """Run a group of tests in order on this thread, capturing what they print."""
+    buffer = output.buffers[threading.get_ident()] = io.StringIO()
+    results = []
+    try:
+        for test_name, test_func in group:
+            result = run_test(test_name, test_func)
+            results.append((test_name, result, buffer.getvalue()))
+            buffer.seek(0)
+            buffer.truncate()
+    finally:
+        del output.buffers[threading.get_ident()]
+    return results
+
 def main():
     """Run all tests."""
+    parser = argparse.ArgumentParser(description="Speech-to-Text Keyboard component tests")
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Open the microphone and record a buffer instead of only checking the device format"
+    )
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("Speech-to-Text Keyboard Component Tests")
     print(f"Platform: {PLATFORM} {platform.version()}")
     print(f"Python: {sys.version}")
     print("=" * 60)
     
-    tests = [
-        ("Imports", test_imports),
-        ("Audio Devices", test_audio_devices),
-        ("Microphone Access", test_microphone_access),
-        ("Whisper Model", test_whisper_model),
-        ("Keyboard Simulation", test_keyboard_simulation),
-        ("Voice Activity Detection", test_vad),
-        ("Configuration", test_configuration)
+    # The remaining tests only need the imports, so these groups run side by
+    # side. Both PortAudio tests share a group: PyAudio() must not be
+    # initialized from two threads at once.
+    groups = [
+        [("Audio Devices", test_audio_devices),
+         ("Microphone Access", lambda: test_microphone_access(full=args.full))],
+        [("Whisper Model", test_whisper_model)],
+        [("Keyboard Simulation", test_keyboard_simulation),
+         ("Voice Activity Detection", test_vad),
+         ("Configuration", test_configuration)]
     ]
     
-    results = []
-    for test_name, test_func in tests:
-        try:
-            result = test_func()
-            results.append((test_name, result))
-        except Exception as e:
-            print(f"\n✗ {test_name} test crashed: {e}")
-            results.append((test_name, False))
+    results = [("Imports", run_test("Imports", test_imports))]
+    if not results[0][1]:
+        # Every other test would only fail again on the same missing package
+        print("\n✗ Skipping the remaining tests until the imports above are fixed.")
+        print("Install the requirements with: pip install -r requirements.txt")
+        return 1
+    
+    output = ThreadOutput(sys.stdout)
+    sys.stdout = output
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(groups)) as executor:
+            futures = [executor.submit(run_group, output, group) for group in groups]
+            # Print each test's output in the usual order as its group finishes
+            for future in futures:
+                for test_name, result, text in future.result():
+                    output.stream.write(text)
+                    results.append((test_name, result))
+    finally:
+        sys.stdout = output.stream
     
     # Summary
     print("\n" + "=" * 60)